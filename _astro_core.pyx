@@ -0,0 +1,20 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Compiled aspect pair scan used by get_aspects when the extension is built."""
+from libc.math cimport fabs, fmod
+
+
+cpdef list aspects_core(const double[::1] lons, const double[::1] exacts, const double[::1] orbs):
+    """Returns (i, j, k) for every planet pair i < j forming aspect k."""
+    cdef Py_ssize_t i, j, k
+    cdef Py_ssize_t n = lons.shape[0]
+    cdef Py_ssize_t n_aspects = exacts.shape[0]
+    cdef double angle
+    cdef list hits = []
+
+    for i in range(n):
+        for j in range(i + 1, n):
+            angle = 180 - fabs(fmod(fabs(lons[i] - lons[j]), 360) - 180)
+            for k in range(n_aspects):
+                if fabs(angle - exacts[k]) <= orbs[k]:
+                    hits.append((i, j, k))
+    return hits
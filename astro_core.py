@@ -0,0 +1,429 @@
+"""Natal chart computation shared by astro_chart and new_program."""
+import bisect
+import functools
+import types
+import numpy as np
+import swisseph as swe
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+try:
+    from _astro_core import aspects_core
+except ImportError:  # Built with `python setup.py build_ext --inplace`; optional
+    aspects_core = None
+
+try:
+    from numba import njit
+    from numba.extending import register_jitable
+except ImportError:  # Numba is optional; get_aspects falls back to plain NumPy
+    njit = None
+
+    def register_jitable(func):
+        return func
+
+__all__ = [
+    "ZODIAC_SIGNS", "ZODIAC_NAMES", "ZODIAC_STARTS", "PLANETS",
+    "ASPECTS", "ASPECT_NAMES", "ASPECT_EXACT", "ASPECT_ORB",
+    "get_zodiac_sign", "get_house_for_planet", "get_house_cusps", "get_planet_positions",
+    "get_aspects", "get_timezone_offset", "get_julian_day", "get_full_chart", "get_full_charts",
+    "clear_caches",
+]
+
+def _read_only(array):
+    """Marks a lookup table array as immutable and returns it."""
+    array.flags.writeable = False
+    return array
+
+
+# Constants
+ZODIAC_NAMES = (
+    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
+)
+ZODIAC_STARTS = _read_only(np.arange(0, 360, 30, dtype=np.float64))
+# (sign, start, end) view of the tables above, kept for backward compatibility
+ZODIAC_SIGNS = tuple((sign, start, start + 30) for sign, start in zip(ZODIAC_NAMES, ZODIAC_STARTS.astype(int).tolist()))
+
+PLANETS = {
+    "Sun": swe.SUN, "Moon": swe.MOON, "Mercury": swe.MERCURY, "Venus": swe.VENUS,
+    "Mars": swe.MARS, "Jupiter": swe.JUPITER, "Saturn": swe.SATURN,
+    "Uranus": swe.URANUS, "Neptune": swe.NEPTUNE, "Pluto": swe.PLUTO,
+    "North Node": swe.MEAN_NODE
+}
+_PLANET_ITEMS = tuple(PLANETS.items())
+_PLANET_NAMES = tuple(PLANETS)
+_HOUSE_KEYS = tuple(f"House {i}" for i in range(1, 13))
+
+# Major aspects as parallel tables: name, exact angle and orb
+ASPECT_NAMES = ("Conjunction", "Opposition", "Trine", "Square", "Sextile")
+ASPECT_EXACT = _read_only(np.array([0, 180, 120, 90, 60], dtype=np.float64))
+ASPECT_ORB = _read_only(np.array([8, 8, 6, 6, 4], dtype=np.float64))
+# {name: (exact, orb)} view of the tables above, kept for backward compatibility
+ASPECTS = types.MappingProxyType({
+    name: (int(exact), int(orb)) for name, exact, orb in zip(ASPECT_NAMES, ASPECT_EXACT, ASPECT_ORB)
+})
+
+# String fragments for rendering, so output text is joined rather than formatted
+_SIGN_PREFIXES = tuple(f"{sign} " for sign in ZODIAC_NAMES)
+_DEGREE_TEXT = tuple(f"{deg}°" for deg in range(30))
+_MINUTE_TEXT = tuple(f"{minutes}′" for minutes in range(60))
+_HOUSE_SUFFIXES = tuple(f", House: {house}" for house in range(13))
+_IN_HOUSE = tuple(f" in House {house} and " for house in range(13))
+_ASPECT_INFIXES = tuple(f" {aspect} " for aspect in ASPECT_NAMES)
+
+def get_zodiac_sign(degree):
+    """Returns the zodiac sign and position within the sign."""
+    idx = int(degree // 30) % 12  # Signs are contiguous 30° bins
+    return ZODIAC_NAMES[idx], _format_position(idx, degree % 30)
+
+
+def _format_position(sign_idx, sign_degree):
+    """Formats a position within a sign, e.g. "Leo 3°27′"."""
+    # sign_degree can round up to exactly 30.0 (e.g. -1e-15 % 30), so clamp to the tables
+    deg = min(int(sign_degree), 29)
+    minutes = min(int((sign_degree - deg) * 60), 59)
+    return "".join((_SIGN_PREFIXES[sign_idx], _DEGREE_TEXT[deg], _MINUTE_TEXT[minutes]))
+
+
+def _render_planet(sign_idx, degree, house):
+    """Renders a planet position, e.g. "Leo 3°27′, House: 5"."""
+    return _format_position(sign_idx, degree % 30) + _HOUSE_SUFFIXES[house]
+
+
+def _render_aspect(planets, signs, houses, i, j, k):
+    """Renders aspect k between planets i and j, e.g. "Sun in House 7 and Leo Trine ..."."""
+    return "".join((planets[i], _IN_HOUSE[houses[i]], signs[i], _ASPECT_INFIXES[k],
+                    planets[j], _IN_HOUSE[houses[j]], signs[j]))
+
+
+def _prepare_house_index(house_cusps):
+    """Sorts the house cusps once per chart so houses can be looked up by bisection.
+
+    Accepts either the list of cusp degrees in house order or the "House N"-keyed dict.
+    """
+    if isinstance(house_cusps, dict):
+        house_cusps = [house_cusps[key]["degree"] for key in _HOUSE_KEYS]
+    pairs = sorted((degree, i) for i, degree in enumerate(house_cusps, start=1))
+    sorted_cusps = [deg for deg, _ in pairs]
+    sorted_house_nos = [house for _, house in pairs]
+    return sorted_cusps, sorted_house_nos
+
+
+def _house_of(planet_degree, sorted_cusps, sorted_house_nos):
+    """Returns the house whose cusp is the last one at or before the planet."""
+    i = bisect.bisect_right(sorted_cusps, planet_degree) - 1
+    # i == -1 means the planet sits before the lowest cusp, i.e. in the house
+    # that wraps around 0° Aries, which is the one with the highest cusp.
+    return sorted_house_nos[i]
+
+
+def _houses_of(lons, sorted_cusps, sorted_house_nos):
+    """Vectorized _house_of: returns the house of every longitude in lons."""
+    # searchsorted returns -1 below the lowest cusp, which wraps to the highest one
+    house_idx = np.searchsorted(sorted_cusps, lons, side="right") - 1
+    return np.asarray(sorted_house_nos)[house_idx].tolist()
+
+
+@register_jitable
+def _fold_angle(diff):
+    """Folds a longitude difference into the 0°-180° angle between two planets.
+
+    Works on scalars and arrays; _astro_core.pyx inlines the same expression in C.
+    """
+    return 180 - np.abs(np.abs(diff) % 360 - 180)
+
+
+def _aspects_kernel(lons, exacts, orbs):
+    """Returns (i, j, k) for every planet pair i < j forming aspect k; compiled with Numba when available."""
+    hits = []
+    n = lons.shape[0]
+    for i in range(n):
+        for j in range(i + 1, n):
+            angle = _fold_angle(lons[i] - lons[j])
+            for k in range(exacts.shape[0]):
+                if abs(angle - exacts[k]) <= orbs[k]:
+                    hits.append((i, j, k))
+    return hits
+
+
+_aspects_jit = njit(cache=True)(_aspects_kernel) if njit is not None else None
+
+
+def _aspect_hits(lons):
+    """Returns (i, j, k) for every planet pair i < j forming aspect k, pair by pair in ASPECT_NAMES order."""
+    if aspects_core is not None:
+        return aspects_core(lons, ASPECT_EXACT, ASPECT_ORB)
+    if _aspects_jit is not None:
+        return _aspects_jit(lons, ASPECT_EXACT, ASPECT_ORB)
+
+    return _aspect_hits_batch(lons[None])[:, 1:].tolist()
+
+
+def _aspect_hits_batch(lons):
+    """Returns (c, i, j, k) for every planet pair i < j of chart c forming aspect k.
+
+    lons has one row of planet longitudes per chart; rows come out in chart order.
+    """
+    # Angular distances of the upper-triangle pairs only, folded so aspects
+    # across 0° Aries are caught; triu_indices walks pairs like the kernel above
+    pair_i, pair_j = np.triu_indices(lons.shape[1], k=1)
+    angles = _fold_angle(lons[:, pair_i] - lons[:, pair_j])
+
+    # nonzero walks (chart, pair, aspect) in row-major order, keeping the kernel's order
+    c, p, k = np.nonzero(np.abs(angles[..., None] - ASPECT_EXACT) <= ASPECT_ORB)
+    return np.column_stack((c, pair_i[p], pair_j[p], k))
+
+
+def get_house_for_planet(planet_degree, house_cusps):
+    """Determines which house a planet is in, correctly handling zodiac wrap-around cases."""
+    return _house_of(planet_degree, *_prepare_house_index(house_cusps))
+
+
+def get_house_cusps(jd_ut, lat, lon, house_system=b"P"):
+    """Calculates house cusps based on Placidus system.
+        House Systems:
+    - "P" = Placidus (default)
+    - "W" = Whole Sign
+    - "K" = Koch
+    - "R" = Regiomontanus
+    - "E" = Equal Houses
+    - "C" = Campanus
+    """
+    house_positions = {}
+    for key, degree in zip(_HOUSE_KEYS, _house_cusps_list(jd_ut, lat, lon, house_system)):
+        sign, formatted_pos = get_zodiac_sign(degree)
+        house_positions[key] = {"degree": degree, "sign": sign, "formatted": formatted_pos}
+    return house_positions
+
+
+def _house_cusps_list(jd_ut, lat, lon, house_system=b"P"):
+    """Calculates the cusp degrees in house order, index 0 being House 1."""
+    return list(swe.houses(jd_ut, lat, lon, house_system)[0][:12])
+
+
+@functools.lru_cache(maxsize=65536)
+def _calc_ut_cached(jd_ut, planet_id):
+    """Returns the ecliptic longitude of a planet, memoized per Julian Day.
+
+    The key ignores global Swiss Ephemeris state; call clear_caches after swe.set_ephe_path.
+    """
+    return swe.calc_ut(jd_ut, planet_id)[0][0]
+
+
+def _planet_columns(jd_ut, house_cusps):
+    """Computes planetary positions as parallel columns in PLANETS order.
+
+    Returns (names, degrees, sign indices, houses), degrees being a float64 array.
+    """
+    lons = np.fromiter((_calc_ut_cached(jd_ut, planet_id) for _, planet_id in _PLANET_ITEMS),
+                       dtype=np.float64, count=len(_PLANET_ITEMS))
+    sign_idx = (lons // 30).astype(np.int64) % 12
+    return _columns_of(lons, sign_idx, house_cusps)
+
+
+def _columns_of(lons, sign_idx, house_cusps):
+    """Builds the planet columns from longitudes and their zodiac sign indices."""
+    houses = _houses_of(lons, *_prepare_house_index(house_cusps))
+    return _PLANET_NAMES, lons, sign_idx.tolist(), houses
+
+
+def get_planet_positions(jd_ut, house_cusps):
+    """Computes planetary positions."""
+    names, lons, sign_idx, houses = _planet_columns(jd_ut, house_cusps)
+    return {planet: {"sign": ZODIAC_NAMES[s], "degree": degree, "house": house,
+                     "formatted": _render_planet(s, degree, house)}
+            for planet, degree, s, house in zip(names, lons.tolist(), sign_idx, houses)}
+
+
+def get_aspects(planet_positions, house_cusps, show_angle=False):
+    """Determines aspects between planets; show_angle appends the exact angle to each."""
+    planets = list(planet_positions.keys())
+    lons = np.array([planet_positions[p]["degree"] for p in planets], dtype=np.float64)
+    signs = [planet_positions[p]["sign"] for p in planets]
+    houses = _houses_of(lons, *_prepare_house_index(house_cusps))
+    return _aspects_of(planets, lons, signs, houses, show_angle=show_angle)
+
+
+def _aspects_of(planets, lons, signs, houses, hits=None, show_angle=False):
+    """Determines aspects between planets given as parallel columns."""
+    if hits is None:
+        hits = _aspect_hits(lons)
+    aspect_list = []
+    for i, j, k in hits:
+        aspect = _render_aspect(planets, signs, houses, i, j, k)
+        if show_angle:
+            angle = _fold_angle(lons[i] - lons[j])
+            aspect += f" ({angle:.2f}°)"
+        aspect_list.append(aspect)
+    return aspect_list
+
+
+_TF = None
+
+
+def _get_tf():
+    """Returns the shared TimezoneFinder; building one loads all the timezone polygons."""
+    global _TF
+    if _TF is None:
+        import timezonefinder  # Deferred: importing it maps the polygon data
+        _TF = timezonefinder.TimezoneFinder()
+    return _TF
+
+
+# ZoneInfo reads the system tz database and falls back to the tzdata package
+_tz_of = functools.lru_cache(maxsize=512)(ZoneInfo)
+
+
+@functools.lru_cache(maxsize=4096)
+def _tz_at(lat_q, lon_q):
+    """Returns the timezone name at a location rounded to 3 decimals (~100 m)."""
+    return _get_tf().timezone_at(lng=lon_q, lat=lat_q)
+
+
+@functools.lru_cache(maxsize=4096)
+def _offset_hours(timezone_str, year, month, day, hour):
+    """Returns the UTC offset in hours of a timezone at the given local hour."""
+    # Get timezone object
+    tz = _tz_of(timezone_str)
+
+    # Convert birth date to a timezone-aware datetime object
+    localized_dt = datetime(year, month, day, hour, 0, tzinfo=tz)
+
+    # Return UTC offset in hours
+    return localized_dt.utcoffset().total_seconds() / 3600
+
+
+def get_timezone_offset(birth_datetime, lat, lon):
+    """Returns the timezone offset (UTC) for the given date and location.
+
+    Local times skipped or repeated by a clock change resolve with fold=0 (the
+    offset in force before the change) instead of raising, and historical
+    local-mean-time offsets keep their seconds, per the installed tz database.
+    """
+    timezone_str = _tz_at(round(lat, 3), round(lon, 3))
+
+    if not timezone_str:
+        raise ValueError("Could not determine the timezone for the given location.")
+
+    return _offset_hours(timezone_str, birth_datetime.year, birth_datetime.month,
+                         birth_datetime.day, birth_datetime.hour)
+
+
+@functools.lru_cache(maxsize=8192)
+def _julian_day_cached(year, month, day, hour, minute, lat_q, lon_q):
+    """Julian Day (UT) for a local time at a location rounded to 3 decimals."""
+    tz_offset = get_timezone_offset(datetime(year, month, day, hour, minute), lat_q, lon_q)
+    return _julian_day_ut(year, month, day, hour, minute, tz_offset)
+
+
+def _julian_day_ut(year, month, day, hour, minute, tz_offset):
+    """Julian Day (UT) for a local time with a known UTC offset in hours."""
+    # Convert local time to UT:
+    hour_ut = hour - tz_offset + (minute / 60.0)
+    return swe.julday(year, month, day, hour_ut)
+
+
+def get_julian_day(birth_datetime, lat, lon, tz_offset=None):
+    """Computes Julian Day for the given birth time and location.
+
+    Pass tz_offset (UTC offset in hours) when it is already known to skip the timezone lookup.
+    """
+    if tz_offset is not None:
+        return _julian_day_ut(birth_datetime.year, birth_datetime.month, birth_datetime.day,
+                              birth_datetime.hour, birth_datetime.minute, tz_offset)
+    return _julian_day_cached(birth_datetime.year, birth_datetime.month, birth_datetime.day,
+                              birth_datetime.hour, birth_datetime.minute, round(lat, 3), round(lon, 3))
+
+
+def _render_chart(house_cusps, names, lons, sign_idx, houses, hits, show_angle):
+    """Renders the computed columns of one chart as the human-readable chart dict."""
+    signs = [ZODIAC_NAMES[s] for s in sign_idx]
+    return {
+        "Planetary Positions": {planet: _render_planet(s, degree, house)
+                                for planet, degree, s, house in zip(names, lons.tolist(), sign_idx, houses)},
+        "House Cusps": {h: get_zodiac_sign(degree)[1] for h, degree in zip(_HOUSE_KEYS, house_cusps)},
+        "Aspects": _aspects_of(names, lons, signs, houses, hits, show_angle)
+    }
+
+
+@functools.lru_cache(maxsize=1024)
+def _full_chart_cached(jd_ut, lat, lon, show_angle):
+    """Computes the full astrology chart, memoized like _calc_ut_cached."""
+    house_cusps = _house_cusps_list(jd_ut, lat, lon)
+    names, lons, sign_idx, houses = _planet_columns(jd_ut, house_cusps)
+    return _render_chart(house_cusps, names, lons, sign_idx, houses, None, show_angle)
+
+
+def clear_caches():
+    """Drops memoized ephemeris results, which go stale when swe.set_ephe_path changes."""
+    _calc_ut_cached.cache_clear()
+    _full_chart_cached.cache_clear()
+
+
+def get_full_chart(birth_datetime, lat, lon, tz_offset=None, show_angle=False):
+    """Computes the full astrology chart.
+
+    tz_offset, if given, is the UTC offset in hours and skips the timezone lookup;
+    show_angle appends the exact angle to every aspect.
+    """
+    jd_ut = get_julian_day(birth_datetime, lat, lon, tz_offset)
+    chart = _full_chart_cached(jd_ut, lat, lon, show_angle)
+
+    # Hand out copies so callers cannot mutate the cached chart
+    return {section: data.copy() for section, data in chart.items()}
+
+
+_BATCH_BLOCK = 10_000  # Charts per get_full_charts block
+
+
+def get_full_charts(birth_datetimes, lats, lons, tz_offsets=None, show_angle=False):
+    """Computes the full astrology chart for every (birth_datetime, lat, lon) triple.
+
+    Planet longitudes, signs and aspects are computed for all charts at once;
+    returns a list of charts in the same form as get_full_chart. tz_offsets, if
+    given, holds the UTC offset in hours of every chart and skips the timezone lookup.
+
+    birth_datetimes may be a sequence of naive local datetimes or a datetime64 array.
+    """
+    if isinstance(birth_datetimes, np.ndarray) and birth_datetimes.dtype.kind == "M":
+        birth_datetimes = birth_datetimes.astype("datetime64[us]").astype(datetime)
+    birth_datetimes = list(birth_datetimes)
+    lats = np.asarray(lats, dtype=np.float64).tolist()
+    lons = np.asarray(lons, dtype=np.float64).tolist()
+    if tz_offsets is None:
+        tz_offsets = [None] * len(lats)
+    if not len(birth_datetimes) == len(lats) == len(lons) == len(tz_offsets):
+        raise ValueError("birth_datetimes, lats, lons and tz_offsets must have the same length.")
+
+    # Work in fixed-size blocks so the aspect scan's temporaries stay bounded
+    charts = []
+    for start in range(0, len(lats), _BATCH_BLOCK):
+        block = slice(start, start + _BATCH_BLOCK)
+        charts.extend(_full_charts_block(birth_datetimes[block], lats[block], lons[block],
+                                         tz_offsets[block], show_angle))
+    return charts
+
+
+def _full_charts_block(birth_datetimes, lats, lons, tz_offsets, show_angle):
+    """Computes one block of get_full_charts, all charts' longitudes and aspects at once."""
+    jds = [get_julian_day(dt, lat, lon, tz_offset)
+           for dt, lat, lon, tz_offset in zip(birth_datetimes, lats, lons, tz_offsets)]
+
+    # Batch longitudes rarely repeat, so bypass _calc_ut_cached rather than flush it
+    planet_lons = np.empty((len(jds), len(_PLANET_ITEMS)), dtype=np.float64)
+    for c, jd_ut in enumerate(jds):
+        for p, (_, planet_id) in enumerate(_PLANET_ITEMS):
+            planet_lons[c, p] = swe.calc_ut(jd_ut, planet_id)[0][0]
+    sign_idx = (planet_lons // 30).astype(np.int64) % 12
+
+    hits = _aspect_hits_batch(planet_lons)
+    # Hits are sorted by chart, so each chart's hits form one contiguous slice
+    bounds = np.searchsorted(hits[:, 0], np.arange(len(jds) + 1)).tolist()
+
+    charts = []
+    for c, (jd_ut, lat, lon) in enumerate(zip(jds, lats, lons)):
+        house_cusps = _house_cusps_list(jd_ut, lat, lon)
+        columns = _columns_of(planet_lons[c], sign_idx[c], house_cusps)
+        chart_hits = hits[bounds[c]:bounds[c + 1], 1:].tolist()
+        charts.append(_render_chart(house_cusps, *columns, chart_hits, show_angle))
+    return charts
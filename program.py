@@ -1,8 +1,8 @@
 import ephem
 from datetime import datetime
+from zoneinfo import ZoneInfo
 import swisseph as swe
 import timezonefinder
-import pytz
 
 # Set the path to your ephemeris files (update the path below)
 swe.set_ephe_path('/path/to/ephe')
@@ -58,11 +58,10 @@ def get_timezone_offset(birth_datetime, lat, lon):
         raise ValueError("Could not determine the timezone for the given location.")
 
     # Get timezone object
-    tz = pytz.timezone(timezone_str)
+    tz = ZoneInfo(timezone_str)
 
     # Convert birth date to a timezone-aware datetime object
-    dt = datetime(birth_datetime.year, birth_datetime.month, birth_datetime.day, birth_datetime.hour, 0)
-    localized_dt = tz.localize(dt, is_dst=None)
+    localized_dt = datetime(birth_datetime.year, birth_datetime.month, birth_datetime.day, birth_datetime.hour, 0, tzinfo=tz)
 
     # Return UTC offset in hours
     return localized_dt.utcoffset().total_seconds() / 3600
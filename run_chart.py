@@ -1,9 +1,10 @@
 from datetime import datetime
 import swisseph as swe
-from astro_chart import generate_chatgpt_prompt, get_full_chart  # Import your function
+from astro_chart import clear_caches, generate_chatgpt_prompt, get_full_chart  # Import your function
 
 # Set path to Swiss Ephemeris files
 swe.set_ephe_path('/path/to/ephe')  # Update with actual path
+clear_caches()  # Drop anything computed before the path was set
 
 # Input birth details
 birth_date = "1986-08-13"
@@ -0,0 +1,23 @@
+"""Installs the chart modules and builds the optional Cython aspect kernel.
+
+Build the kernel in place for development with: python setup.py build_ext --inplace
+"""
+from setuptools import Extension, setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:  # Without Cython astro_core falls back to Numba or NumPy
+    ext_modules = []
+else:
+    ext_modules = cythonize([Extension("_astro_core", ["_astro_core.pyx"], optional=True)])
+    # cythonize rebuilds the Extension without optional; keep the install working
+    # when there is no usable C compiler
+    for ext in ext_modules:
+        ext.optional = True
+
+setup(
+    name="astro_chart",
+    py_modules=["astro_core", "astro_chart", "new_program"],
+    ext_modules=ext_modules,
+    install_requires=["numpy", "pyswisseph", "timezonefinder", "tzdata"],
+)
@@ -1,7 +1,10 @@
 import pdb
+import numpy as np
 import pytest
 from datetime import datetime
-from astro_chart import get_zodiac_sign, get_house_for_planet, get_aspects, get_julian_day, get_full_chart
+import astro_core
+from astro_chart import (get_zodiac_sign, get_house_for_planet, get_aspects, get_julian_day, get_full_chart,
+                         get_full_charts, get_timezone_offset)
 
 # Sample house cusps for testing
 SAMPLE_HOUSE_CUSPS = {
@@ -25,6 +28,11 @@ def test_get_zodiac_sign():
     assert get_zodiac_sign(359) == ("Pisces", "Pisces 29°0′")
 
 
+def test_get_zodiac_sign_out_of_range():
+    assert get_zodiac_sign(-1e-15) == ("Pisces", "Pisces 29°59′")
+    assert get_zodiac_sign(365) == ("Aries", "Aries 5°0′")
+
+
 def test_get_house_for_planet():
     """Test planet placement for all 12 houses."""
     house_cusps = {
@@ -117,4 +125,84 @@ def test_full_chart():
     assert "Venus in House 8 and Libra Square Neptune in House 12 and Capricorn" in chart["Aspects"][8]
     assert "Jupiter in House 2 and Pisces Square Uranus in House 11 and Sagittarius" in chart["Aspects"][9]
     assert "Uranus in House 11 and Sagittarius Trine North Node in House 2 and Aries" in chart["Aspects"][10]
-    assert "Neptune in House 12 and Capricorn Sextile Pluto in House 9 and Scorpio" in chart["Aspects"][11]
\ No newline at end of file
+    assert "Neptune in House 12 and Capricorn Sextile Pluto in House 9 and Scorpio" in chart["Aspects"][11]
+
+def test_get_full_charts_matches_get_full_chart():
+    births = [
+        (datetime(1986, 8, 13, 19, 40), 55.7558, 37.6173),
+        (datetime(1990, 1, 1, 12, 0), 40.7128, -74.0060),
+        (datetime(2001, 6, 21, 6, 15), -33.8688, 151.2093),
+    ]
+    charts = get_full_charts(*zip(*births))
+    assert charts == [get_full_chart(*birth) for birth in births]
+
+
+def test_get_full_charts_across_blocks(monkeypatch):
+    monkeypatch.setattr(astro_core, "_BATCH_BLOCK", 2)
+    births = [
+        (datetime(1986, 8, 13, 19, 40), 55.7558, 37.6173),
+        (datetime(1990, 1, 1, 12, 0), 40.7128, -74.0060),
+        (datetime(2001, 6, 21, 6, 15), -33.8688, 151.2093),
+    ]
+    charts = get_full_charts(*zip(*births))
+    assert charts == [get_full_chart(*birth) for birth in births]
+
+
+def test_get_full_charts_accepts_datetime64():
+    birth_datetimes = np.array(["1986-08-13T19:40", "1990-01-01T12:00"], dtype="datetime64[m]")
+    charts = get_full_charts(birth_datetimes, [55.7558, 40.7128], [37.6173, -74.0060])
+    assert charts[0] == get_full_chart(datetime(1986, 8, 13, 19, 40), 55.7558, 37.6173)
+
+
+def test_get_full_charts_rejects_mismatched_lengths():
+    birth_datetime = datetime(1986, 8, 13, 19, 40)
+    with pytest.raises(ValueError):
+        get_full_charts([birth_datetime] * 3, [55.7558, 1.0], [37.6173])
+    with pytest.raises(ValueError):
+        get_full_charts([birth_datetime] * 2, [55.7558] * 2, [37.6173] * 2, tz_offsets=[4])
+
+
+def test_get_julian_day_with_known_offset():
+    birth_datetime = datetime(1986, 8, 13, 19, 40)
+    # Moscow was on UTC+4 (summer time) in August 1986
+    assert get_julian_day(birth_datetime, 55.7558, 37.6173, tz_offset=4) == get_julian_day(birth_datetime, 55.7558, 37.6173)
+
+
+def test_get_timezone_offset_local_mean_time():
+    # Moscow kept local mean time (UTC+2:30:17) until 1919
+    offset = get_timezone_offset(datetime(1900, 1, 1, 12, 0), 55.7558, 37.6173)
+    assert offset == pytest.approx(2 + 30 / 60 + 17 / 3600)
+
+
+def test_get_timezone_offset_clock_changes():
+    # 02:00-03:00 was skipped on 1986-03-30 and repeated on 1986-09-28; both
+    # resolve to the offset in force before the change
+    assert get_timezone_offset(datetime(1986, 3, 30, 2, 30), 55.7558, 37.6173) == 3
+    assert get_timezone_offset(datetime(1986, 9, 28, 2, 30), 55.7558, 37.6173) == 4
+
+
+# Random planet longitudes for the aspect backend test
+RANDOM_LONGITUDES = np.random.default_rng(0).uniform(0, 360, size=(200, 11))
+
+
+@pytest.mark.parametrize("backend", ["numpy", "cython", "numba"])
+def test_aspect_backends_match_kernel(backend):
+    """Every aspect scan backend must return the pure-Python kernel's (i, j, k) hits."""
+    exacts, orbs = astro_core.ASPECT_EXACT, astro_core.ASPECT_ORB
+    if backend == "numpy":
+        def scan(lons):
+            return astro_core._aspect_hits_batch(lons[None])[:, 1:]
+    elif backend == "cython":
+        aspects_core = pytest.importorskip("_astro_core").aspects_core
+
+        def scan(lons):
+            return aspects_core(lons, exacts, orbs)
+    else:
+        pytest.importorskip("numba")
+
+        def scan(lons):
+            return astro_core._aspects_jit(lons, exacts, orbs)
+
+    for lons in RANDOM_LONGITUDES:
+        expected = [list(hit) for hit in astro_core._aspects_kernel(lons, exacts, orbs)]
+        assert [list(hit) for hit in scan(lons)] == expected